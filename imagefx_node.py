@@ -1,33 +1,180 @@
 import os
 import requests
+from requests.adapters import HTTPAdapter
 import base64
 import json
 import time
+from types import MappingProxyType
 import folder_paths
-from PIL import Image
 import io
-import numpy as np
-import uuid
-import torch
+import functools
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+import importlib
+import re
+import warnings
 from io import BytesIO
 
+# 优先使用SIMD加速的pybase64解码，未安装时回退到标准库
+try:
+    import pybase64
+
+    def b64decode(data):
+        return pybase64.b64decode(data, validate=False)
+except ImportError:
+    b64decode = base64.b64decode
+
+# 优先使用orjson进行JSON序列化/解析，未安装时回退到标准库
+try:
+    import orjson
+    json_dumps = orjson.dumps
+    json_loads = orjson.loads
+except ImportError:
+    def json_dumps(obj):
+        return json.dumps(obj).encode("utf-8")
+    json_loads = json.loads
+
+# 安装了ijson时流式解析API响应，否则一次性解析完整JSON
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# torch.frombuffer对只读bytes会发出警告；本模块中这些缓冲区只被读取，直接忽略该警告以避免额外拷贝
+# （在模块级设置一次，warnings.catch_warnings在解码线程池中并非线程安全）
+warnings.filterwarnings(
+    "ignore",
+    message="The given buffer is not writable",
+    category=UserWarning,
+    module=re.escape(__name__),
+)
+
+# 后台写盘线程池，图片保存不阻塞节点输出
+_IO_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="imagefx-io")
+
+def _write_bytes(path, data):
+    """将字节数据写入文件"""
+    with open(path, "wb") as f:
+        f.write(data)
+
+def _response_too_large(max_bytes):
+    """构造响应体超出大小上限时的异常"""
+    return Exception(f"API响应超过大小上限: {max_bytes} 字节")
+
+class _SizeLimitedReader:
+    """包装响应流，累计读取的字节数超过上限时抛出异常（覆盖没有Content-Length的分块响应）"""
+    
+    def __init__(self, raw, max_bytes):
+        self._raw = raw
+        self._max_bytes = max_bytes
+        self._bytes_read = 0
+    
+    def read(self, size=-1):
+        data = self._raw.read(size if size is not None and size >= 0 else None)
+        self._bytes_read += len(data)
+        if self._bytes_read > self._max_bytes:
+            raise _response_too_large(self._max_bytes)
+        return data
+
 class ImageFXAPINode:
     """
     调用ImageFX API生成图片的ComfyUI节点
     基于官方API实现，完全匹配原始请求格式
     """
     
+    # 静态API请求头（完全匹配原始请求），认证头在每次请求时单独附加
+    _BASE_HEADERS = MappingProxyType({
+        "accept": "*/*",
+        "accept-language": "en-US,en;q=0.9",
+        "content-type": "text/plain;charset=UTF-8",
+        "dnt": "1",
+        "origin": "https://labs.google",
+        "priority": "u=1, i",
+        "referer": "https://labs.google/",
+        "sec-ch-ua": '"Not(A:Brand";v="99", "Google Chrome";v="133", "Chromium";v="133"',
+        "sec-ch-ua-mobile": "?0",
+        "sec-ch-ua-platform": '"Linux"',
+        "sec-fetch-dest": "empty",
+        "sec-fetch-mode": "cors",
+        "sec-fetch-site": "cross-site",
+        "user-agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/133.0.0.0 Safari/537.36",
+    })
+    
+    # 生成图片文件名用的进程内递增计数器
+    _counter = itertools.count()
+    
+    # 延迟导入的重型模块（torch/PIL/torchvision），仅在节点实际执行时加载
+    _torch = None
+    _pil_image = None
+    _torchvision_io = None
+    _torchvision_transforms = None
+    
+    @classmethod
+    def _get_torch(cls):
+        """首次使用时导入torch并缓存"""
+        if cls._torch is None:
+            cls._torch = importlib.import_module("torch")
+        return cls._torch
+    
+    @classmethod
+    def _get_pil_image(cls):
+        """首次使用时导入PIL.Image并缓存"""
+        if cls._pil_image is None:
+            cls._pil_image = importlib.import_module("PIL.Image")
+        return cls._pil_image
+    
+    def _get_torchvision_io(self):
+        """首次使用时导入torchvision.io并缓存，不可用时返回None（回退到PIL解码）"""
+        cls = type(self)
+        if cls._torchvision_io is None:
+            try:
+                cls._torchvision_io = importlib.import_module("torchvision.io")
+            except Exception as e:
+                # 除未安装外，torchvision与torch版本不匹配时导入也可能抛出RuntimeError等异常
+                cls._torchvision_io = False
+                self.log(f"torchvision不可用，回退到PIL解码: {str(e)}")
+        return cls._torchvision_io or None
+    
+    @classmethod
+    def _get_torchvision_transforms(cls):
+        """首次使用时导入torchvision.transforms.functional并缓存"""
+        if cls._torchvision_transforms is None:
+            cls._torchvision_transforms = importlib.import_module("torchvision.transforms.functional")
+        return cls._torchvision_transforms
+    
     def __init__(self):
         # 从环境变量或配置文件获取认证令牌
         self.auth_token = self._get_auth_token()
+        # 确保认证令牌格式正确（添加Bearer前缀）
+        if self.auth_token.startswith("Bearer "):
+            self._auth_header = self.auth_token
+        else:
+            self._auth_header = "Bearer " + self.auth_token
         # 实际API端点
         self.api_url = "https://aisandbox-pa.googleapis.com/v1:runImageFx"
+        # 复用同一个HTTP会话，避免每次请求都重新建立TCP/TLS连接
+        self.session = self._create_session()
+        # 请求超时（连接超时, 读取超时），避免网络异常时无限阻塞ComfyUI的执行线程
+        self.timeout = (10, 120)
+        # 响应体大小上限，防止异常响应占满内存（10张Base64编码的PNG通常远小于此值）
+        self.max_response_bytes = 64 * 1024 * 1024
         # 确保有一个文件夹来保存生成的图片
         self.output_dir = os.path.join(folder_paths.get_output_directory(), "imagefx_outputs")
         if not os.path.exists(self.output_dir):
             os.makedirs(self.output_dir)
         # 调试模式
         self.debug = True
+        # 文件名前缀（进程ID+启动时间），配合类级计数器保证文件名唯一
+        self._session_prefix = f"{os.getpid():x}{int(time.time()):x}"
+    
+    def _create_session(self):
+        """创建带连接池的HTTP会话，并预先设置静态请求头"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=10)
+        session.mount("https://", adapter)
+        
+        session.headers.update(self._BASE_HEADERS)
+        return session
     
     def log(self, message):
         """记录日志信息（如果调试模式开启）"""
@@ -62,6 +209,7 @@ class ImageFXAPINode:
                 "seed": ("INT", {"default": -1}),  # -1表示随机种子
                 "aspect_ratio": (["LANDSCAPE", "PORTRAIT", "SQUARE"], {"default": "LANDSCAPE"}),
                 "model_type": (["IMAGEN_3_1"], {"default": "IMAGEN_3_1"}),
+                "max_side": ("INT", {"default": 0, "min": 0, "max": 8192}),  # 0表示不缩放
             }
         }
     
@@ -70,36 +218,215 @@ class ImageFXAPINode:
     FUNCTION = "generate_images"
     CATEGORY = "image/external"
     
+    # 按(高, 宽)缓存的空白图像张量，ComfyUI将节点输出视为只读，可直接共享
+    _EMPTY_CACHE = {}
+    
     def generate_empty_image(self, width=512, height=512):
-        """生成标准格式的空白RGB图像张量"""
-        empty_image = np.ones((height, width, 3), dtype=np.float32) * 0.2
-        tensor = torch.from_numpy(empty_image).unsqueeze(0)  # [1, H, W, 3]
-        
-        self.log(f"创建ComfyUI兼容的空白图像: 形状={tensor.shape}, 类型={tensor.dtype}")
+        """生成标准格式的空白RGB图像张量（同尺寸复用缓存）"""
+        key = (height, width)
+        tensor = self._EMPTY_CACHE.get(key)
+        if tensor is None:
+            torch = self._get_torch()
+            tensor = torch.full((1, height, width, 3), 0.2, dtype=torch.float32)  # [1, H, W, 3]
+            self._EMPTY_CACHE[key] = tensor
+            self.log(f"创建ComfyUI兼容的空白图像: 形状={tensor.shape}, 类型={tensor.dtype}")
         return tensor
     
-    def convert_pil_to_tensor(self, pil_image):
-        """将单个PIL图像转换为ComfyUI兼容的张量格式"""
+    def convert_pil_to_tensor(self, pil_image, max_side=0):
+        """将单个PIL图像转换为[H, W, 3] uint8像素张量，失败时返回None（归一化在_to_comfy_images中批量完成）"""
         try:
-            # 确保是RGB模式
+            need_resize = max_side and max(pil_image.size) > max_side
+            if need_resize:
+                # draft()仅对JPEG等格式生效，需在图像加载前调用，可在解码阶段直接降采样
+                pil_image.draft("RGB", (max_side, max_side))
+            
+            # 确保是RGB模式（需在缩放前完成，P/1等模式下thumbnail会忽略BILINEAR而使用NEAREST）
             if pil_image.mode != 'RGB':
                 pil_image = pil_image.convert('RGB')
                 self.log(f"已将图像转换为RGB模式")
             
-            # 转换为ComfyUI格式
-            img_array = np.array(pil_image).astype(np.float32) / 255.0
-            img_tensor = torch.from_numpy(img_array).unsqueeze(0)  # [1, H, W, 3]
+            # 如果设置了最长边限制，在转换为张量前先缩小图像
+            if need_resize:
+                Image = self._get_pil_image()
+                pil_image.thumbnail((max_side, max_side), Image.Resampling.BILINEAR)
+                self.log(f"已将图像缩小到: {pil_image.size}")
+            
+            torch = self._get_torch()
+            
+            # 直接从PIL像素缓冲区构建uint8张量
+            width, height = pil_image.size
+            # tobytes()返回只读bytes，张量只会被读取（归一化时写入新的float32张量），无需再拷贝为可写缓冲区
+            img_tensor = torch.frombuffer(pil_image.tobytes(), dtype=torch.uint8).view(height, width, 3)  # [H, W, 3]
             
             self.log(f"PIL图像成功转换为张量: 形状={img_tensor.shape}, 类型={img_tensor.dtype}")
             return img_tensor
         
         except Exception as e:
             self.log(f"PIL转张量失败: {str(e)}")
-            # 返回空白图像作为后备
-            return self.generate_empty_image()
+            # 由调用方以空白图像作为后备
+            return None
+    
+    def convert_bytes_to_tensor(self, image_bytes, max_side=0):
+        """使用torchvision将编码后的图片字节直接解码为[H, W, 3] uint8像素张量（归一化在_to_comfy_images中批量完成）"""
+        torch = self._get_torch()
+        torchvision_io = self._get_torchvision_io()
+        
+        # bytes为只读缓冲区，decode_image只读取输入，直接构建张量视图而不拷贝
+        data = torch.frombuffer(image_bytes, dtype=torch.uint8)
+        img_tensor = torchvision_io.decode_image(data, mode=torchvision_io.ImageReadMode.RGB)  # [3, H, W] uint8
+        
+        # 如果设置了最长边限制，在uint8阶段按比例缩小，避免分配全尺寸的float32张量
+        _, height, width = img_tensor.shape
+        if max_side and max(height, width) > max_side:
+            scale = max_side / max(height, width)
+            new_size = [max(1, round(height * scale)), max(1, round(width * scale))]
+            img_tensor = self._get_torchvision_transforms().resize(img_tensor, new_size, antialias=True)
+            self.log(f"已将图像缩小到: {new_size[1]}x{new_size[0]}")
+        
+        # CHW->HWC仅改变视图，写入float32输出张量时才完成连续化，避免额外的布局拷贝
+        img_tensor = img_tensor.permute(1, 2, 0)  # [H, W, 3]
+        
+        self.log(f"图片字节成功解码为张量: 形状={img_tensor.shape}, 类型={img_tensor.dtype}")
+        return img_tensor
+    
+    def _decode_one(self, encoded_image, image_seed, max_side=0):
+        """解码单张Base64图片，保存到文件并转换为uint8像素张量，返回(张量或None, 文件名)"""
+        # 解码Base64图片数据
+        image_bytes = b64decode(encoded_image)
+        
+        # 在后台保存图片到文件（API返回的已是PNG数据，直接写入，无需PIL重新编码）
+        filename = f"imagefx_seed{image_seed}_{self._session_prefix}_{next(self._counter):06d}.png"
+        save_path = os.path.join(self.output_dir, filename)
+        future = _IO_POOL.submit(_write_bytes, save_path, image_bytes)
+        future.add_done_callback(functools.partial(self._on_save_done, filename))
+        
+        # 转换为uint8像素张量
+        img_tensor = None
+        if self._get_torchvision_io() is not None:
+            try:
+                img_tensor = self.convert_bytes_to_tensor(image_bytes, max_side)
+            except Exception as e:
+                self.log(f"torchvision解码失败，回退到PIL: {str(e)}")
+        
+        if img_tensor is None:
+            # 将字节数据转换为PIL图像（仅用于张量转换）
+            pil_image = self._get_pil_image().open(io.BytesIO(image_bytes))
+            img_tensor = self.convert_pil_to_tensor(pil_image, max_side)
+        
+        self.log(f"成功生成图片: {filename} (种子: {image_seed})")
+        return img_tensor, filename
+    
+    def _to_comfy_images(self, pixel_tensors):
+        """将[H, W, 3] uint8像素张量列表转换为ComfyUI的[1, H, W, 3] float32张量列表（NHWC连续内存布局）"""
+        torch = self._get_torch()
+        valid_tensors = [t for t in pixel_tensors if t is not None]
+        if not valid_tensors:
+            return [self.generate_empty_image() for _ in pixel_tensors]
+        
+        height, width, _ = valid_tensors[0].shape
+        if all(t.shape == valid_tensors[0].shape for t in valid_tensors):
+            # 尺寸一致时一次性分配[N, H, W, 3]批次张量，逐张写入后统一原地归一化，各输出为其切片视图
+            # ComfyUI的IMAGE约定为CPU张量，因此不迁移到GPU
+            batch = torch.empty((len(pixel_tensors), height, width, 3), dtype=torch.float32)
+            for i, t in enumerate(pixel_tensors):
+                if t is not None:
+                    batch[i].copy_(t)
+            batch.div_(255.0)
+            for i, t in enumerate(pixel_tensors):
+                if t is None:
+                    # 转换失败的图片以空白图像填充
+                    batch[i].fill_(0.2)
+            return [batch[i:i + 1] for i in range(batch.shape[0])]
+        
+        # 尺寸不一致时逐张转换
+        image_tensors = []
+        for t in pixel_tensors:
+            if t is None:
+                image_tensors.append(self.generate_empty_image(width, height))
+            else:
+                img_tensor = t.to(torch.float32, memory_format=torch.contiguous_format).div_(255.0)
+                image_tensors.append(img_tensor.unsqueeze(0))  # [1, H, W, 3]
+        return image_tensors
+    
+    def _on_save_done(self, filename, future):
+        """后台保存任务完成时的回调"""
+        error = future.exception()
+        if error is not None:
+            self.log(f"保存图片失败: {filename}, {str(error)}")
+        else:
+            self.log(f"已保存图片: {filename}")
+    
+    def _raise_api_error(self, error_info):
+        """根据响应中的error对象抛出格式化的API错误"""
+        error_message = f"API错误: 代码 {error_info.get('code')}, 消息: {error_info.get('message')}, 状态: {error_info.get('status')}"
+        self.log(error_message)
+        raise Exception(error_message)
+    
+    def _iter_streamed_images(self, raw):
+        """流式解析API响应，依次产出每个生成图像对象，遇到顶层error对象时抛出API错误"""
+        image_prefix = "imagePanels.item.generatedImages.item"
+        builder = None
+        builder_prefix = None
+        end_event = None
+        
+        for prefix, event, value in ijson.parse(raw):
+            if builder is None:
+                if prefix in (image_prefix, "error") and event in ("start_map", "start_array"):
+                    builder = ijson.ObjectBuilder()
+                    builder_prefix = prefix
+                    end_event = event.replace("start", "end")
+                    builder.event(event, value)
+                continue
+            
+            builder.event(event, value)
+            if prefix == builder_prefix and event == end_event:
+                obj = builder.value
+                builder = None
+                if builder_prefix == "error":
+                    # 检查响应中是否有错误
+                    self._raise_api_error(obj if isinstance(obj, dict) else {"message": obj})
+                elif isinstance(obj, dict):
+                    yield obj
+    
+    def _iter_generated_images(self, response):
+        """从API响应中依次取出(Base64图片数据, 种子)，安装了ijson时以流式方式解析"""
+        if ijson is not None:
+            # 流式解析，避免将包含多张Base64图片的完整响应一次性载入内存
+            response.raw.decode_content = True
+            reader = _SizeLimitedReader(response.raw, self.max_response_bytes)
+            generated_images = self._iter_streamed_images(reader)
+        else:
+            # 分块读取完整响应，累计超过上限时立即中止
+            chunks = []
+            bytes_read = 0
+            for chunk in response.iter_content(chunk_size=1024 * 1024):
+                bytes_read += len(chunk)
+                if bytes_read > self.max_response_bytes:
+                    raise _response_too_large(self.max_response_bytes)
+                chunks.append(chunk)
+            response_data = json_loads(b"".join(chunks))
+            
+            # 检查响应中是否有错误
+            if "error" in response_data:
+                self._raise_api_error(response_data["error"])
+            
+            # 遍历所有图像面板中的所有生成图像
+            generated_images = (
+                image_data
+                for panel in response_data.get("imagePanels", [])
+                for image_data in panel.get("generatedImages", [])
+            )
+        
+        for image_data in generated_images:
+            # 获取Base64编码的图片数据
+            encoded_image = image_data.get("encodedImage", "")
+            image_seed = image_data.get("seed", "unknown")
+            
+            if encoded_image:
+                yield encoded_image, image_seed
     
     def generate_images(self, prompt, image_count=4, seed=-1,
-                       aspect_ratio="LANDSCAPE", model_type="IMAGEN_3_1"):
+                       aspect_ratio="LANDSCAPE", model_type="IMAGEN_3_1", max_side=0):
         """
         调用ImageFX API生成图片
         """
@@ -109,30 +436,6 @@ class ImageFXAPINode:
         # 创建会话ID（使用时间戳，类似于示例代码）
         session_id = f";{int(time.time() * 1000)}"
         
-        # 确保认证令牌格式正确（添加Bearer前缀）
-        auth_header = self.auth_token
-        if not auth_header.startswith("Bearer "):
-            auth_header = "Bearer " + auth_header
-        
-        # 构建API请求头（完全匹配原始请求）
-        headers = {
-            "accept": "*/*",
-            "accept-language": "en-US,en;q=0.9",
-            "content-type": "text/plain;charset=UTF-8",
-            "dnt": "1",
-            "origin": "https://labs.google",
-            "priority": "u=1, i",
-            "referer": "https://labs.google/",
-            "sec-ch-ua": '"Not(A:Brand";v="99", "Google Chrome";v="133", "Chromium";v="133"',
-            "sec-ch-ua-mobile": "?0",
-            "sec-ch-ua-platform": '"Linux"',
-            "sec-fetch-dest": "empty",
-            "sec-fetch-mode": "cors",
-            "sec-fetch-site": "cross-site",
-            "user-agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/133.0.0.0 Safari/537.36",
-            "authorization": auth_header
-        }
-        
         # 将aspect_ratio转换为API需要的格式
         aspect_ratio_value = f"IMAGE_ASPECT_RATIO_{aspect_ratio}"
         
@@ -163,86 +466,60 @@ class ImageFXAPINode:
             self.log(f"宽高比: {aspect_ratio}")
             
             # 发送API请求
-            response = requests.post(
+            response = self.session.post(
                 self.api_url,
-                headers=headers,
-                json=payload
+                headers={"authorization": self._auth_header},
+                data=json_dumps(payload),
+                timeout=self.timeout,
+                stream=True
             )
             
-            if response.status_code != 200:
-                self.log(f"API响应状态码: {response.status_code}")
-                self.log(f"API响应内容: {response.text}")
-                raise Exception(f"API请求失败: {response.status_code} {response.text}")
-            
-            response_data = response.json()
-            
-            # 检查响应中是否有错误
-            if "error" in response_data:
-                error_info = response_data["error"]
-                error_message = f"API错误: 代码 {error_info.get('code')}, 消息: {error_info.get('message')}, 状态: {error_info.get('status')}"
-                self.log(error_message)
-                raise Exception(error_message)
-            
-            # 处理返回的图片
-            image_tensors = []
+            try:
+                # 根据Content-Length提前拒绝过大的响应
+                content_length = response.headers.get("Content-Length")
+                if content_length and content_length.isdigit() and int(content_length) > self.max_response_bytes:
+                    raise _response_too_large(self.max_response_bytes)
+                
+                if response.status_code != 200:
+                    self.log(f"API响应状态码: {response.status_code}")
+                    self.log(f"API响应内容: {response.text}")
+                    raise Exception(f"API请求失败: {response.status_code} {response.text}")
+                
+                # 边接收响应边解析图片，每解析出一张就立即提交到线程池解码（保持API返回的顺序）
+                max_workers = max(1, min(image_count, 8))
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = [
+                        executor.submit(self._decode_one, encoded_image, image_seed, max_side)
+                        for encoded_image, image_seed in self._iter_generated_images(response)
+                    ]
+                    results = [future.result() for future in futures]
+            finally:
+                response.close()
             
-            # 遍历所有图像面板
-            for panel in response_data.get("imagePanels", []):
-                # 遍历每个面板中的所有生成图像
-                for image_data in panel.get("generatedImages", []):
-                    # 获取Base64编码的图片数据
-                    encoded_image = image_data.get("encodedImage", "")
-                    image_seed = image_data.get("seed", "unknown")
-                    
-                    if encoded_image:
-                        # 解码Base64图片数据
-                        image_bytes = base64.b64decode(encoded_image)
-                        
-                        # 将字节数据转换为PIL图像
-                        pil_image = Image.open(io.BytesIO(image_bytes))
-                        
-                        # 保存图片到文件
-                        filename = f"imagefx_seed{image_seed}_{uuid.uuid4().hex[:8]}.png"
-                        save_path = os.path.join(self.output_dir, filename)
-                        
-                        # 确保是RGB模式后保存
-                        if pil_image.mode != 'RGB':
-                            pil_image = pil_image.convert('RGB')
-                        pil_image.save(save_path)
-                        
-                        # 转换为ComfyUI张量格式
-                        img_tensor = self.convert_pil_to_tensor(pil_image)
-                        image_tensors.append(img_tensor)
-                        
-                        self.log(f"成功生成并保存图片: {filename} (种子: {image_seed})")
+            # 只将作为返回值的前4张图片转换为ComfyUI张量格式
+            image_tensors = self._to_comfy_images([img_tensor for img_tensor, _ in results[:4]])
             
-            self.log(f"总共生成了 {len(image_tensors)} 张图片")
+            self.log(f"总共生成了 {len(results)} 张图片")
             
             # 检查是否有图片生成
             if len(image_tensors) == 0:
                 raise Exception("API没有返回任何图片")
                 
-            # 如果需要补充到4张图片
-            while len(image_tensors) < 4:
-                # 获取第一张图片的尺寸
-                if image_tensors:
-                    first_tensor = image_tensors[0]
-                    _, height, width, _ = first_tensor.shape
-                    empty_tensor = self.generate_empty_image(width, height)
-                else:
-                    # 默认尺寸
-                    empty_tensor = self.generate_empty_image(512, 512)
-                
-                image_tensors.append(empty_tensor)
+            # 如果需要补充到4张图片，使用与第一张图片同尺寸的空白图像
+            missing = 4 - len(image_tensors)
+            if missing > 0:
+                _, height, width, _ = image_tensors[0].shape
+                empty_tensor = self.generate_empty_image(width, height)
+                image_tensors = image_tensors + [empty_tensor] * missing
             
             # 只使用前4张图片作为返回值
             return tuple(image_tensors[:4])
             
         except Exception as e:
             self.log(f"发生错误: {str(e)}")
-            # 发生错误时返回4张空白图片
-            empty_tensors = [self.generate_empty_image() for _ in range(4)]
-            return tuple(empty_tensors)
+            # 发生错误时返回4张空白图片（共享同一个只读张量）
+            empty_tensor = self.generate_empty_image()
+            return (empty_tensor, empty_tensor, empty_tensor, empty_tensor)
 
     @classmethod
     def IS_CHANGED(cls, **kwargs):